@@ -21,5 +21,7 @@ async def list_sessions():
 async def end_session(sid: int):
     sess = _sessions.get(sid)
     if not sess: return {"error": "not found"}
-    sess.status = "ended"
+    # schemas are frozen: store an updated copy instead of mutating in place
+    sess = sess.model_copy(update={"status": "ended"})
+    _sessions[sid] = sess
     return sess
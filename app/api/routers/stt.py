@@ -1,4 +1,5 @@
 from fastapi import APIRouter, UploadFile, File
+from fastapi.responses import StreamingResponse
 from app.schemas.stt import STTRequest, STTResponse
 from app.services.stt.whisper_service import WhisperService
 from app.core.config import settings
@@ -12,3 +13,15 @@ async def transcribe(payload: STTRequest | None = None, audio: UploadFile = File
     # bias prompt by role keywords later if you want
     text = await svc.transcribe(data, language=(payload.language if payload and payload.language else "en"))
     return STTResponse(text=text, duration_sec=None)
+
+@router.post("/stream")
+async def transcribe_stream(payload: STTRequest | None = None, audio: UploadFile = File(...)):
+    data = await audio.read()
+    language = payload.language if payload and payload.language else "en"
+
+    async def _lines():
+        # one line per segment, flushed as soon as Whisper decodes it
+        async for text in svc.transcribe_stream(data, language=language, content_type=(audio.content_type or "")):
+            yield text + "\n"
+
+    return StreamingResponse(_lines(), media_type="text/plain; charset=utf-8")
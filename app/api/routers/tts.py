@@ -1,11 +1,11 @@
 # app/api/routers/tts.py
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
 import math
 import struct
-import wave
 import re
 import time
 from pathlib import Path
@@ -13,10 +13,11 @@ from typing import Tuple, Union, Optional, Literal
 
 import numpy as np
 from fastapi import APIRouter, HTTPException, Header
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
-from app.services.tts.bark_service import get_bark_service
+from app.schemas.tts import TTSRequest
+from app.services.tts.bark_service import BarkService, get_bark_service
 from app.services.judge.ollama_client import OllamaJudge
 
 log = logging.getLogger("tts")
@@ -105,6 +106,9 @@ def _word_budget(req) -> tuple[int, str, int]:
     return mw, hint, mt
 
 _SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_NGRAM_LOOP = re.compile(r"\b((\w+\s+){1,3}\w+)\b(?:\s+\1\b){1,}", re.IGNORECASE)
+_WORD_LOOP = re.compile(r"(\b[\w\'\-]{3,}\b)(?:\s+\1){1,}", re.IGNORECASE)
+_MULTI_WS = re.compile(r"\s{2,}")
 def _clamp_words(text: str, max_words: int) -> str:
     text = (text or "").strip()
     if not text:
@@ -149,13 +153,13 @@ def _dedupe_tts_text(txt: str, user_seed: str = "") -> str:
         if out and p_norm == out[-1].strip():
             continue  # drop identical consecutive sentence
         # Short n-gram loops like "in the in the"
-        p2 = re.sub(r"\b((\w+\s+){1,3}\w+)\b(?:\s+\1\b){1,}", r"\1", p_norm, flags=re.IGNORECASE)
+        p2 = _NGRAM_LOOP.sub(r"\1", p_norm)
         # Single-word loops like "really really"
-        p3 = re.sub(r"(\b[\w\'\-]{3,}\b)(?:\s+\1){1,}", r"\1", p2, flags=re.IGNORECASE)
+        p3 = _WORD_LOOP.sub(r"\1", p2)
         out.append(p3)
 
     s2 = " ".join(out).strip()
-    return re.sub(r"\s{2,}", " ", s2).strip()
+    return _MULTI_WS.sub(" ", s2).strip()
 
 
 # -------------------- Request models --------------------
@@ -177,6 +181,7 @@ class SpeakRequest(BaseModel):
     # Voice & playback knobs
     voice: Optional[str] = Field(None, description="Voice/persona id or .npz prompt path")
     speed: Optional[float] = Field(None, gt=0.25, lt=4.0, description="Playback speed multiplier")
+    format: Literal["wav", "opus"] = Field("wav", description="'opus' returns Ogg/Opus (~10x smaller)")
 
     # Length controls
     length: Optional[Literal["short", "medium", "long"]] = Field(None, description="High-level length hint")
@@ -206,32 +211,18 @@ def _to_mono_f32(audio: np.ndarray) -> np.ndarray:
             return audio.mean(axis=0, dtype=np.float32)
     return audio.reshape(-1).astype(np.float32, copy=False)
 
-def _normalize_peak(audio: np.ndarray, peak: float = 0.99) -> np.ndarray:
-    if audio.size == 0:
-        return audio
-    m = float(np.max(np.abs(audio)))
-    if m > 0:
-        audio = (audio / m) * peak
-    return np.clip(audio, -1.0, 1.0)
-
 def float_to_pcm16_wav_bytes(audio: Union[np.ndarray, list, None], sr: int) -> bytes:
-    audio = _normalize_peak(_to_mono_f32(_ensure_array(audio)))
-    pcm16 = (audio * 32767.0).astype(np.int16, copy=False)
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(int(sr))
-        wf.writeframes(pcm16.tobytes())
-    return buf.getvalue()
+    audio = BarkService._normalize_peak(_to_mono_f32(_ensure_array(audio)))
+    return BarkService._to_wav_bytes(audio, int(sr))
+
+def _media_type(audio: bytes) -> str:
+    return "audio/ogg" if audio[:4] == b"OggS" else "audio/wav"
 
 def gen_beep_wav_bytes(duration_s: float = 0.35, freq: float = 880.0, sr: int = 24000) -> bytes:
     n = int(duration_s * sr)
     buf = io.BytesIO()
     def w(fmt, *v): buf.write(struct.pack(fmt, *v))
-    buf.write(b"RIFF"); w("<I", 36 + n*2); buf.write(b"WAVEfmt ")
-    w("<I", 16); w("<H", 1); w("<H", 1); w("<I", sr); w("<I", sr*2); w("<H", 2); w("<H", 16)
-    buf.write(b"data"); w("<I", n*2)
+    buf.write(BarkService._wav_header(sr, n * 2))
     twopi_over_sr = 2.0 * math.pi / sr
     for i in range(n):
         s = int(32767 * math.sin(twopi_over_sr * freq * i))
@@ -282,7 +273,7 @@ async def tts_say(
     if cached is not None:
         return Response(
             cached,
-            media_type="audio/wav",
+            media_type=_media_type(cached),
             headers={
                 "Cache-Control": "no-store",
                 "X-Idempotency": "hit",
@@ -347,28 +338,33 @@ async def tts_say(
         svc = get_bark_service()
         voice_arg = str(VOICE_PATH) if VOICE_PATH.exists() else (req.voice or "v2/en_speaker_7")
 
+        stretch = bool(req.speed and abs(req.speed - 1.0) > 1e-3)
         wav_bytes = await svc.synthesize_bytes(
             tts_text,
             voice=voice_arg,
             seed=12345,
+            encode="wav" if stretch else req.format,
         )
 
         # Optional playback speed
-        if req.speed and abs(req.speed - 1.0) > 1e-3:
+        if stretch:
             try:
                 import soundfile as sf, librosa
                 y, sr = sf.read(io.BytesIO(wav_bytes), dtype="float32")
                 if y.ndim > 1:
                     y = y.mean(axis=1)
                 y2 = librosa.effects.time_stretch(y, rate=float(req.speed))
-                wav_bytes = float_to_pcm16_wav_bytes(y2, sr)
+                if req.format == "opus":
+                    wav_bytes = await asyncio.to_thread(svc._to_opus_bytes, BarkService._normalize_peak(y2), sr)
+                else:
+                    wav_bytes = float_to_pcm16_wav_bytes(y2, sr)
             except Exception as e:
                 log.warning("[TTS] speed stretch failed (%s); returning original audio", e)
 
         _cache_put(x_req_id, wav_bytes)
         return Response(
             wav_bytes,
-            media_type="audio/wav",
+            media_type=_media_type(wav_bytes),
             headers={
                 "Cache-Control": "no-store",
                 "X-Idempotency": "store" if x_req_id else "none",
@@ -433,6 +429,38 @@ async def tts_say(
             },
         )
 
+@router.post("/stream", summary="Stream WAV audio chunk by chunk as Bark renders it")
+async def tts_stream(req: TTSRequest):
+    svc = get_bark_service()
+    gen = svc.synthesize_stream(
+        req.text,
+        voice=req.voice,
+        use_small=req.use_small,
+        seed=12345 if req.seed is None else req.seed,
+        text_temp=req.text_temp,
+        waveform_temp=req.waveform_temp,
+    )
+    # pull header + first chunk before committing to a 200: warmup/render errors become a 5xx
+    try:
+        first = await gen.__anext__()
+    except Exception as e:
+        await gen.aclose()
+        log.exception("[TTS] stream failed before first chunk: %s", e)
+        raise HTTPException(status_code=500, detail=f"TTS failed: {type(e).__name__}")
+
+    async def _body():
+        try:
+            yield first
+            async for part in gen:
+                yield part
+        finally:
+            await gen.aclose()
+
+    return StreamingResponse(
+        _body(), media_type="audio/wav",
+        headers={"Cache-Control": "no-store", "X-TTS-SR": "24000"},
+    )
+
 @router.post("/warm", summary="Preload models / warm the TTS backend")
 async def tts_warm():
     try:
@@ -1,5 +1,7 @@
 # app/core/config.py
 
+from functools import lru_cache
+from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
@@ -23,4 +25,11 @@ class Settings(BaseSettings):
         extra="ignore",   # ignore unknown env vars instead of raising errors
     )
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    # .env is parsed once here. load_dotenv also exports it to os.environ, since the
+    # services read their knobs (WHISPER_*, TTS_BARK_DEVICE, ...) via os.getenv
+    load_dotenv()
+    return Settings()
+
+settings = get_settings()
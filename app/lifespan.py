@@ -1,13 +1,37 @@
 # app/lifespan.py
+import asyncio
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from app.core.config import settings
 from app.services.tts.bark_service import get_bark_service
+from app.services.ipa.mapping import en_to_ipa
+from app.services.stt.whisper_service import WhisperService
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    try:
+        # load the eng_to_ipa dictionary now instead of inside the first /ipa or /sim/score request
+        en_to_ipa("warmup")
+    except Exception as e:
+        print(f"[lifespan] IPA warmup skipped: {e}")
     try:
         # warm Bark on CPU with small models (safe + fast)
         get_bark_service().warm_models(use_small=True)
     except Exception as e:
         print(f"[lifespan] Bark warmup skipped: {e}")
+
+    keepalive = None
+    if os.getenv("WHISPER_PRELOAD", "1") == "1":
+        try:
+            # the model is shared at class level, so this warms the routers' instances too
+            asr = WhisperService(settings.WHISPER_MODEL)
+            await asr.warmup()
+            every_min = float(os.getenv("WHISPER_KEEPALIVE_MIN", "10"))
+            if every_min > 0:
+                keepalive = asyncio.create_task(asr.keepalive(every_min * 60))
+        except Exception as e:
+            print(f"[lifespan] Whisper warmup skipped: {e}")
     yield
+    if keepalive is not None:
+        keepalive.cancel()
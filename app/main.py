@@ -29,9 +29,6 @@ from app.api.routers import (                      # All API routers (organized
 )
 from app.lifespan import lifespan                  # Startup/shutdown event handler
 
-from dotenv import load_dotenv
-load_dotenv()  # will read .env in project root
-
 # ---------------------------------------------------------------------
 # 1. Configure logging
 # ---------------------------------------------------------------------
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class Msg(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     msg: str
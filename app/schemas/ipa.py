@@ -1,33 +1,45 @@
 # app/schemas/ipa.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 
 class Options(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     theta_mode: str = Field("t", description='"t" or "s" for /θ/')
     mode: str = Field("strict", description='"strict" or "approx"')
     r_variant: str = Field("tap", description='"tap" or "trill"')
     schwa: str = Field("e", description='"e" or "a"')
 
 class TokenResult(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     token: str
     english_ipa: str
     latam_ipa: str
     respelling: Optional[str] = None
 
 class PronounceRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     text: str
     options: Optional[Options] = None
     respell: bool = True
 
 class PronounceResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     text: str
     tokens: List[TokenResult]
 
 class PronScoreRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     expected_text: str
     heard_text: str
     options: Optional[Options] = None
 
 class PronScoreResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     overall: dict
     words: list
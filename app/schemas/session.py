@@ -1,9 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class SessionCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     user_id: int
 
 class SessionOut(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     id: int
     user_id: int
     status: str
@@ -1,50 +1,70 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 
 class SimStartReq(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     role: str = Field(..., examples=["node-react"])
     level: str = Field(..., examples=["junior","mid","senior"])
     mode: str = Field(..., examples=["technical","behavioral","mixed"])
 
 class SimStartRes(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: str
     question_id: str
     question: str
 
 class SimNextReq(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: str
 
 class SimNextRes(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     question_id: str
     question: str
 
 class SimAnswerTextReq(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: str
     question_id: str
     text: str
 
 class SimAnswerAudioRes(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: str
     question_id: str
     asr_text: str
     confidence: float | None = None
 
 class SimScoreReq(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: str
     question_id: str
     expected_text: str | None = None  # NEW: if provided, we do strict pronunciation scoring
 
 class ScoreBreakdown(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     content: int
     pronunciation: int
     fluency: int
     overall: int
 
 class SimScoreRes(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     scores: ScoreBreakdown
     tips: List[str] = []
 
 class SimReportRes(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: str
     turns: list[dict]
     overall_avg: int
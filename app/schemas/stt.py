@@ -1,8 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class STTRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     language: str | None = None
 
 class STTResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     text: str
     duration_sec: float | None = None
@@ -1,7 +1,9 @@
 # app/schemas/tts.py
-from pydantic import BaseModel, Field, constr
+from pydantic import BaseModel, Field, constr, ConfigDict
 
 class TTSRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     text: constr(min_length=1, max_length=2000)
     voice: str | None = None
     use_small: bool | None = None
@@ -9,6 +9,7 @@ except Exception:
     engipa = None
 
 WORD_RE = re.compile(r"[A-Za-z']+")
+_STRIP_MARKS = str.maketrans("", "", "ːˈˌ")  # length + stress marks
 
 def tokenize(text: str) -> List[str]:
     return WORD_RE.findall(text or "")
@@ -35,7 +36,7 @@ def _apply_vowels(s: str) -> str:
     return s
 
 def map_to_latam(ipa: str, *, theta="t", mode="strict", r="tap", schwa="e") -> str:
-    s = ipa.replace("ː","").replace("ˈ","").replace("ˌ","")
+    s = ipa.translate(_STRIP_MARKS)
     s = s.replace("ð","d").replace("θ","s" if theta=="s" else "t")
     s = s.replace("ɚ","er").replace("ɝ","er")
     if mode == "strict":
@@ -55,10 +56,11 @@ def respell(latam_ipa: str) -> str:
 PHONES = ["t͡ʃ","d͡ʒ","aʊ","aɪ","eɪ","oʊ","əʊ","ɔɪ","iː","uː","ɔː","ɑː",
           "æ","ʌ","ɪ","ʊ","ŋ","ʃ","ʒ","ɹ","ð","θ","ə","ɑ","ɛ","i","u","o","a","ɔ","e",
           "p","b","t","d","k","ɡ","f","v","s","z","h","m","n","l","w","j","r","ɾ","ʝ"]
-PHONES_RE = re.compile("|".join(map(re.escape, PHONES)))
+# longest phones first so the alternation always takes e.g. "t͡ʃ" over "t"
+PHONES_RE = re.compile("|".join(map(re.escape, sorted(PHONES, key=len, reverse=True))))
 
 def split_ipa(ipa: str) -> List[str]:
-    s = ipa.replace("ˈ","").replace("ˌ","").replace("ː","")
+    s = ipa.translate(_STRIP_MARKS)
     toks = PHONES_RE.findall(s)
     return toks if toks else list(s)
 
@@ -99,8 +101,9 @@ def score_pronunciation(ref_text: str, hyp_text: str,
         ref = ref_lat[i] if i<len(ref_lat) else ""
         hyp = hyp_lat[i] if i<len(hyp_lat) else ""
         if ref and hyp:
-            dist, ops = edit_ops(split_ipa(ref), split_ipa(hyp))
-            acc = 1.0 - (dist / max(len(split_ipa(ref)),1))
+            ref_ph = split_ipa(ref)
+            dist, ops = edit_ops(ref_ph, split_ipa(hyp))
+            acc = 1.0 - (dist / max(len(ref_ph),1))
             tot += acc; cnt += 1
         else:
             acc, ops = 0.0, ["skip"]
@@ -4,10 +4,15 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 import httpx
 
+try:
+    from orjson import loads as _json_loads
+except Exception:  # orjson is optional; stdlib json also accepts bytes
+    _json_loads = json.loads
+
 
 # ---- Env defaults -----------------------------------------------------------
 
@@ -36,6 +41,27 @@ def _normalize_url(host: Optional[str], url: Optional[str]) -> str:
     return f"{base}{GENERATE_PATH}"
 
 
+def _pop_ndjson(buf: bytearray) -> List[Dict[str, Any]]:
+    """
+    Parse every complete (newline-terminated) line in `buf` and drop those
+    bytes from it; a trailing partial line stays buffered for the next read.
+    Works on raw bytes so lines we discard are never decoded to str.
+    """
+    objs: List[Dict[str, Any]] = []
+    start = 0
+    while (nl := buf.find(b"\n", start)) != -1:
+        line = buf[start:nl]
+        start = nl + 1
+        if not line.strip():
+            continue
+        try:
+            objs.append(_json_loads(line))
+        except Exception:
+            continue
+    del buf[:start]
+    return objs
+
+
 def _extract_last_json_block(text: str) -> Optional[Dict[str, Any]]:
     """
     Extract the last JSON object from a messy LLM string.
@@ -195,15 +221,20 @@ class OllamaJudge:
         async with httpx.AsyncClient(timeout=None) as client:
             async with client.stream("POST", self.url, json=payload) as r:
                 r.raise_for_status()
-                async for line in r.aiter_lines():
-                    if not line:
-                        continue
-                    try:
-                        obj = json.loads(line)
-                    except Exception:
-                        continue
+                buf = bytearray()
+                async for raw in r.aiter_bytes():
+                    buf += raw
+                    for obj in _pop_ndjson(buf):
+                        if obj.get("done"):
+                            return
+                        chunk = obj.get("response")
+                        if chunk:
+                            yield chunk
+                # flush a final line that arrived without a trailing newline
+                buf += b"\n"
+                for obj in _pop_ndjson(buf):
                     if obj.get("done"):
-                        break
+                        return
                     chunk = obj.get("response")
                     if chunk:
                         yield chunk
@@ -219,15 +250,20 @@ class OllamaJudge:
         with httpx.Client(timeout=None) as client:
             with client.stream("POST", self.url, json=payload) as r:
                 r.raise_for_status()
-                for line in r.iter_lines():
-                    if not line:
-                        continue
-                    try:
-                        obj = json.loads(line)
-                    except Exception:
-                        continue
+                buf = bytearray()
+                for raw in r.iter_bytes():
+                    buf += raw
+                    for obj in _pop_ndjson(buf):
+                        if obj.get("done"):
+                            return
+                        chunk = obj.get("response")
+                        if chunk:
+                            yield chunk
+                # flush a final line that arrived without a trailing newline
+                buf += b"\n"
+                for obj in _pop_ndjson(buf):
                     if obj.get("done"):
-                        break
+                        return
                     chunk = obj.get("response")
                     if chunk:
                         yield chunk
@@ -0,0 +1,108 @@
+# app/services/stt/_utils.py
+"""Helpers shared by the STT service: env parsing, CUDA error sniffing, transcript cleanup."""
+from __future__ import annotations
+import os, re
+
+def _env(name: str, default: str) -> str:
+    v = os.getenv(name)
+    return default if v is None or v == "" else v
+
+def _is_cuda_alloc_error(msg: str) -> bool:
+    m = msg.lower()
+    return ("cudnn_status" in m or "device_allocation_failed" in m or
+            "out of memory" in m or ("cuda" in m and "failed" in m))
+
+# --- Stronger repetition cleaner for ASR text --------------------------------
+try:
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio  # C++ implementation, 0..100
+except Exception:
+    import difflib
+    def _fuzz_ratio(a: str, b: str) -> float:
+        return 100.0 * difflib.SequenceMatcher(None, a, b).ratio()
+
+_CLAUSE_SPLIT = re.compile(r"[\.!\?,;:\n]\s*")
+_NON_WORD = re.compile(r"[^a-z0-9'\s]")
+_WS = re.compile(r"\s+")
+_PHRASE_LOOP = re.compile(r"\b((\w+\s+){1,3}\w+)\b(?:\s+\1\b){1,}", re.IGNORECASE)
+_WORD_LOOP = re.compile(r"(\b[\w\'\-]{3,}\b)(?:\s+\1){1,}", re.IGNORECASE)
+_HELLO_LEAD = re.compile(r"^(hello[\s,;:!-]+){1,}", re.IGNORECASE)
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([?!.,;:])")
+
+def _normalize_for_compare(s: str) -> str:
+    # one regex pass; the trailing-punctuation strip needs no regex at all
+    return _WS.sub(" ", s.lower().strip()).rstrip(".?!")
+
+def _norm_clause(s: str) -> str:
+    s = s.lower().strip()
+    s = _NON_WORD.sub(" ", s)
+    s = _WS.sub(" ", s).strip()
+    return s
+
+def _similar(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    # quick substring heuristic
+    if a in b or b in a:
+        la, lb = len(a), len(b)
+        return min(la, lb) / max(la, lb)
+    return _fuzz_ratio(a, b) / 100.0
+
+def _clean_transcript(text: str) -> str:
+    """
+    Split by clauses, drop near-duplicate restarts and short garbled tails,
+    collapse token loops, and tidy punctuation.
+    """
+    s = (text or "").strip()
+    if not s:
+        return s
+
+    raw = [c.strip() for c in _CLAUSE_SPLIT.split(s) if c and c.strip()]
+    kept, kept_norm = [], []
+
+    for c in raw:
+        # collapse short loops inside a clause
+        c2 = _PHRASE_LOOP.sub(r"\1", c)
+        c2 = _WORD_LOOP.sub(r"\1", c2)
+        cn = _norm_clause(c2)
+        if not cn:
+            continue
+
+        words = cn.split()
+        is_short = len(words) <= 4
+        drop = False
+
+        for i, prev in enumerate(kept_norm):
+            sim = _similar(cn, prev)
+            # short fragments that largely overlap an earlier clause → drop
+            if is_short and sim >= 0.75:
+                drop = True
+                break
+            # near-duplicate clause → keep only the longer/clearer one
+            if sim >= 0.88:
+                if len(c2) <= len(kept[i]):
+                    drop = True
+                else:
+                    kept[i] = c2
+                    kept_norm[i] = cn
+                break
+
+        if not drop:
+            kept.append(c2)
+            kept_norm.append(cn)
+
+    # Normalize repeated "hello" leads
+    for i in range(len(kept)):
+        kept[i] = _HELLO_LEAD.sub("Hello, ", kept[i]).strip()
+
+    # Remove consecutive exact dupes after normalization
+    out = []
+    for c in kept:
+        if out and _norm_clause(c) == _norm_clause(out[-1]):
+            continue
+        out.append(c)
+
+    final = ". ".join(out).strip()
+    final = _SPACE_BEFORE_PUNCT.sub(r"\1", final)
+    if final and final[-1] not in ".!?":
+        final += "."
+    return final
@@ -1,26 +1,34 @@
 # app/services/stt/audio_decode.py
 from __future__ import annotations
 import io
+from typing import Optional
 import numpy as np
 
-def decode_to_float32_mono_16k(raw_bytes: bytes) -> tuple[np.ndarray, int]:
+def decode_to_float32_mono_16k(raw_bytes: bytes, out: Optional[np.ndarray] = None) -> tuple[np.ndarray, int]:
     """
     Use PyAV (ffmpeg bindings) to decode *any* typical container to
     float32 mono @16k. Falls back to soundfile if PyAV is missing.
+    If `out` (float32) is large enough, the PyAV result is written into
+    its head and a view of it is returned instead of a new array.
     """
     try:
         import av  # type: ignore
         with av.open(io.BytesIO(raw_bytes), mode="r") as container:
             astream = next(s for s in container.streams if s.type == "audio")
-            resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=16000)
-            chunks = []
+            # resample straight to float32 so there is no int16 intermediate
+            resampler = av.audio.resampler.AudioResampler(format="flt", layout="mono", rate=16000)
+            parts: list[np.ndarray] = []
             for frame in container.decode(astream):
-                frame = resampler.resample(frame)
-                for p in frame.planes:
-                    chunks.append(p.to_bytes())
-            pcm16 = b"".join(chunks)
-        audio = np.frombuffer(pcm16, dtype=np.int16).astype(np.float32) / 32768.0
-        return audio, 16000
+                res = resampler.resample(frame)
+                # PyAV >= 9 returns a list of frames, older versions a single frame
+                for f in (res if isinstance(res, list) else [res]):
+                    parts.append(f.to_ndarray().reshape(-1))
+        if not parts:
+            return np.zeros(0, dtype=np.float32), 16000
+        n = sum(p.size for p in parts)
+        if out is not None and out.dtype == np.float32 and out.size >= n:
+            return np.concatenate(parts, out=out[:n]), 16000
+        return np.concatenate(parts).astype(np.float32, copy=False), 16000
     except Exception:
         # Fallback: try soundfile (handles wav, flac, ogg, m4a, mp3 depending on libsndfile)
         try:
@@ -28,13 +36,18 @@ def decode_to_float32_mono_16k(raw_bytes: bytes) -> tuple[np.ndarray, int]:
             data, sr = sf.read(io.BytesIO(raw_bytes), dtype="float32", always_2d=True)
             mono = data.mean(axis=1).astype("float32", copy=False)
             if sr != 16000:
-                # simple resample via librosa if available; otherwise leave sr as-is
+                # resample via soxr (C/SIMD) if available, else librosa; otherwise leave sr as-is
                 try:
-                    import librosa  # type: ignore
-                    mono = librosa.resample(mono, orig_sr=sr, target_sr=16000)
+                    import soxr  # type: ignore
+                    mono = soxr.resample(mono, sr, 16000, quality="HQ")
                     sr = 16000
                 except Exception:
-                    pass
+                    try:
+                        import librosa  # type: ignore
+                        mono = librosa.resample(mono, orig_sr=sr, target_sr=16000)
+                        sr = 16000
+                    except Exception:
+                        pass
             return mono, sr
         except Exception as e:
             raise RuntimeError(f"Audio decode failed: {type(e).__name__}: {e}")
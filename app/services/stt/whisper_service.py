@@ -1,117 +1,38 @@
 # app/services/stt/whisper_service.py
 from __future__ import annotations
-from typing import Optional, Tuple
-import os, tempfile, asyncio, logging, re
-from difflib import SequenceMatcher
+from typing import AsyncIterator, Optional, Tuple
+import os, tempfile, asyncio, logging, functools, threading
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import torch
 from faster_whisper import WhisperModel
 
+from app.services.stt._utils import _env, _is_cuda_alloc_error, _clean_transcript
+from app.services.stt.audio_decode import decode_to_float32_mono_16k
+
 log = logging.getLogger("whisper")
 _lock = asyncio.Lock()
 
-def _env(name: str, default: str) -> str:
-    v = os.getenv(name)
-    return default if v is None or v == "" else v
-
-def _is_cuda_alloc_error(msg: str) -> bool:
-    m = msg.lower()
-    return ("cudnn_status" in m or "device_allocation_failed" in m or
-            "out of memory" in m or ("cuda" in m and "failed" in m))
-
-def _normalize_for_compare(s: str) -> str:
-    s = s.lower().strip()
-    s = re.sub(r"\s+", " ", s)
-    s = re.sub(r"[.?!]+$", "", s)
-    return s
-
-# --- Stronger repetition cleaner for ASR text --------------------------------
-import difflib
-
-_CLAUSE_SPLIT = re.compile(r"[\.!\?,;:\n]\s*")
-
-def _norm_clause(s: str) -> str:
-    s = s.lower().strip()
-    s = re.sub(r"[^a-z0-9'\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def _similar(a: str, b: str) -> float:
-    if not a or not b:
-        return 0.0
-    # quick substring heuristic
-    if a in b or b in a:
-        la, lb = len(a), len(b)
-        return min(la, lb) / max(la, lb)
-    return difflib.SequenceMatcher(None, a, b).ratio()
-
-def _clean_transcript(text: str) -> str:
-    """
-    Split by clauses, drop near-duplicate restarts and short garbled tails,
-    collapse token loops, and tidy punctuation.
-    """
-    s = (text or "").strip()
-    if not s:
-        return s
-
-    raw = [c.strip() for c in _CLAUSE_SPLIT.split(s) if c and c.strip()]
-    kept, kept_norm = [], []
-
-    for c in raw:
-        # collapse short loops inside a clause
-        c2 = re.sub(r"\b((\w+\s+){1,3}\w+)\b(?:\s+\1\b){1,}", r"\1", c, flags=re.IGNORECASE)
-        c2 = re.sub(r"(\b[\w\'\-]{3,}\b)(?:\s+\1){1,}", r"\1", c2, flags=re.IGNORECASE)
-        cn = _norm_clause(c2)
-        if not cn:
-            continue
-
-        words = cn.split()
-        is_short = len(words) <= 4
-        drop = False
-
-        for i, prev in enumerate(kept_norm):
-            sim = _similar(cn, prev)
-            # short fragments that largely overlap an earlier clause → drop
-            if is_short and sim >= 0.75:
-                drop = True
-                break
-            # near-duplicate clause → keep only the longer/clearer one
-            if sim >= 0.88:
-                if len(c2) <= len(kept[i]):
-                    drop = True
-                else:
-                    kept[i] = c2
-                    kept_norm[i] = cn
-                break
-
-        if not drop:
-            kept.append(c2)
-            kept_norm.append(cn)
-
-    # Normalize repeated "hello" leads
-    for i in range(len(kept)):
-        kept[i] = re.sub(r"^(hello[\s,;:!-]+){1,}", "Hello, ", kept[i], flags=re.IGNORECASE).strip()
-
-    # Remove consecutive exact dupes after normalization
-    out = []
-    for c in kept:
-        if out and _norm_clause(c) == _norm_clause(out[-1]):
-            continue
-        out.append(c)
-
-    final = ". ".join(out).strip()
-    final = re.sub(r"\s+([?!.,;:])", r"\1", final)
-    if final and final[-1] not in ".!?":
-        final += "."
-    return final
-
-# Try to import the high-quality decoder
-try:
-    from app.services.stt.audio_decode import decode_to_float32_mono_16k  # type: ignore
-    _HAS_DECODER = True
-except Exception:
-    _HAS_DECODER = False
+# Checkpoints that have a monolingual "<name>.en" sibling
+_EN_VARIANTS = {"tiny", "base", "small", "medium"}
+
+# Path-fallback tempfiles can go to tmpfs (e.g. WHISPER_TMPDIR=/dev/shm) so ffmpeg reads
+# from RAM; opt-in because Docker caps /dev/shm at 64 MB by default
+_TMPDIR = os.getenv("WHISPER_TMPDIR") or None
+
+def _cuda_int8_unsupported(device_index: int) -> bool:
+    # CTranslate2 refuses INT8 on compute capability 12.x (RTX 50-series)
+    try:
+        major, _ = torch.cuda.get_device_capability(device_index)
+        return major >= 12
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=32)
+def _tokenize_prompt(hf_tokenizer, prompt: str) -> Tuple[int, ...]:
+    # same encoding faster-whisper applies to a str initial_prompt
+    return tuple(hf_tokenizer.encode(" " + prompt.strip(), add_special_tokens=False).ids)
 
 class WhisperService:
     """
@@ -122,6 +43,7 @@ class WhisperService:
       - Env-configurable knobs
     ENV (optional):
       WHISPER_MODEL (default: "base.en")
+      WHISPER_ENGLISH_ONLY ("1"/"0", default: "0") map tiny/base/small/medium to their .en checkpoint
       WHISPER_DEVICE ("cuda"/"cpu", default: auto)
       WHISPER_DEVICE_INDEX (default: "0")
       WHISPER_COMPUTE ("float16"/"int8_float16"/"int8", default: auto)
@@ -129,6 +51,13 @@ class WhisperService:
       WHISPER_BEST_OF (default: "5")
       WHISPER_TEMPERATURE (default: "0")
       WHISPER_CHUNK_LENGTH (seconds, default: "15")
+      WHISPER_MAX_SECONDS (default: "120") size of the reusable decode buffer
+      WHISPER_NUM_WORKERS (default: "2") parallel CTranslate2 workers on CUDA
+      WEB_CONCURRENCY (default: "1") uvicorn workers sharing the CPU, sizes cpu_threads
+      WHISPER_TMPDIR (default: system temp dir) dir for path-fallback tempfiles, e.g. /dev/shm
+      WHISPER_MODEL_DIR (default: HF cache) download_root shared by all workers
+      WHISPER_PRELOAD ("1"/"0", default: "1") load + warm the model at app startup
+      WHISPER_KEEPALIVE_MIN (minutes, default: "10", "0" disables) periodic silent warmup
     """
     _model: Optional[WhisperModel] = None
     _loaded_cfg: Optional[Tuple[str, str, str, int]] = None
@@ -142,6 +71,15 @@ class WhisperService:
     ):
         # bump default a notch for quality
         self.model_name   = model_name   or _env("WHISPER_MODEL", "base.en")
+        # Opt-in: the monolingual checkpoint skips language detection and has a smaller
+        # decode path, but transcribes any audio as English, so only enable it when every
+        # caller sends English. Only plain size names have an .en variant.
+        english_only = os.getenv("WHISPER_ENGLISH_ONLY")
+        if english_only == "1" and self.model_name in _EN_VARIANTS:
+            self.model_name += ".en"
+        elif not english_only and self.model_name in _EN_VARIANTS:
+            log.warning("[WhisperService] multilingual model '%s' in use; set WHISPER_ENGLISH_ONLY=1 "
+                        "to use '%s.en' if all traffic is English", self.model_name, self.model_name)
         self.device       = device       or _env("WHISPER_DEVICE", "cuda" if torch.cuda.is_available() else "cpu")
         self.device_index = int(device_index if device_index is not None else _env("WHISPER_DEVICE_INDEX", "0"))
         self.compute_type = compute_type or _env("WHISPER_COMPUTE",
@@ -149,9 +87,23 @@ class WhisperService:
 
         # Better decoding defaults (you can still override via env)
         self.beam_size     = int(_env("WHISPER_BEAM_SIZE", "5"))
-        self.best_of       = int(_env("WHISPER_BEST_OF", "5"))
+        # candidates per sampled segment; only used when temperature > 0
+        self.best_of       = max(1, int(_env("WHISPER_BEST_OF", "5")))
         self.temperature   = float(_env("WHISPER_TEMPERATURE", "0"))
         self.chunk_length  = int(_env("WHISPER_CHUNK_LENGTH", "15"))
+        self.num_workers   = max(1, int(_env("WHISPER_NUM_WORKERS", "2")))
+
+        # Dedicated threads for blocking model calls: sized to the CTranslate2
+        # workers on GPU, half the cores on CPU
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_workers if self.device == "cuda" else max(2, (os.cpu_count() or 2) // 2),
+            thread_name_prefix="whisper",
+        )
+
+        # Reusable decode buffer (lazily allocated); longer clips fall back to a fresh array
+        self.max_seconds   = int(_env("WHISPER_MAX_SECONDS", "120"))
+        self._scratch: Optional[np.ndarray] = None
+        self._scratch_lock = asyncio.Lock()
 
         log.warning(
             "[WhisperService] target model='%s' device=%s compute=%s index=%d (beam=%d best_of=%d temp=%.2f chunk=%ds)",
@@ -159,10 +111,42 @@ class WhisperService:
             self.beam_size, self.best_of, self.temperature, self.chunk_length
         )
 
+    def _build_model(self, cfg: Tuple[str, str, str, int]) -> WhisperModel:
+        model_name, device, compute_type, device_index = cfg
+        extra = {}
+        if device == "cuda":
+            # stream-ordered allocator returns freed blocks to the driver instead of
+            # growing a private cache (VRAM creep on long-running services)
+            os.environ.setdefault("CT2_CUDA_ALLOCATOR", "cuda_malloc_async")
+        else:
+            # split the cores between uvicorn workers instead of each one using all of them
+            workers = max(1, int(_env("WEB_CONCURRENCY", "1")))
+            intra = max(1, (os.cpu_count() or 1) // workers)
+            extra["cpu_threads"] = intra
+        kwargs = dict(
+            device=device,
+            device_index=device_index,
+            compute_type=compute_type,
+            # >1 lets concurrent transcribe() calls from different threads run in parallel
+            num_workers=self.num_workers if device == "cuda" else 1,
+            # shared cache dir: workers mmap the same weight files (one page-cache copy)
+            download_root=_env("WHISPER_MODEL_DIR", "") or None,
+            **extra,
+        )
+        try:
+            # skip the HF Hub round-trip when the model is already on disk
+            return WhisperModel(model_name, local_files_only=True, **kwargs)
+        except FileNotFoundError:
+            log.warning("[WhisperService] '%s' not cached locally; downloading", model_name)
+            return WhisperModel(model_name, local_files_only=False, **kwargs)
+
     async def _load_model(self, device: Optional[str] = None, compute_type: Optional[str] = None):
         target_device = device or self.device
         target_compute = compute_type or (self.compute_type if target_device == self.device
                                           else ("int8" if target_device == "cpu" else self.compute_type))
+        if target_device == "cuda" and target_compute.startswith("int8") and _cuda_int8_unsupported(self.device_index):
+            log.warning("[WhisperService] INT8 unsupported on this GPU; using float16")
+            target_compute = "float16"
         cfg = (self.model_name, target_device, target_compute, self.device_index)
         if WhisperService._model is not None and WhisperService._loaded_cfg == cfg:
             return
@@ -171,12 +155,16 @@ class WhisperService:
                 return
             log.warning("[WhisperService] loading: model=%s device=%s compute=%s idx=%d",
                         *cfg)
-            WhisperService._model = WhisperModel(
-                self.model_name,
-                device=cfg[1],
-                device_index=cfg[3],
-                compute_type=cfg[2],
-            )
+            try:
+                WhisperService._model = self._build_model(cfg)
+            except (ValueError, RuntimeError) as e:
+                if cfg[1] != "cuda" or not cfg[2].startswith("int8") or "int8" not in str(e).lower():
+                    raise
+                log.warning("[WhisperService] INT8 load refused (%s). Retrying with float16.", e)
+                if self.compute_type == cfg[2]:
+                    self.compute_type = "float16"  # stop asking for int8 on later calls
+                cfg = (cfg[0], cfg[1], "float16", cfg[3])
+                WhisperService._model = self._build_model(cfg)
             WhisperService._loaded_cfg = cfg
 
     async def _ensure_model(self):
@@ -189,6 +177,37 @@ class WhisperService:
             else:
                 raise
 
+    def _transcribe_silence(self) -> None:
+        # one second of silence is enough to build the CTranslate2/cuDNN kernels
+        segments, _ = WhisperService._model.transcribe(
+            audio=np.zeros(16000, dtype=np.float32), language="en", beam_size=1, vad_filter=False,
+        )
+        for _ in segments:
+            pass
+        # faster-whisper caches its Silero ONNX session; create it now, not on the first request
+        try:
+            from faster_whisper.vad import get_vad_model
+            get_vad_model()
+        except Exception as e:
+            log.warning("[WhisperService] VAD warmup skipped: %s", e)
+
+    async def warmup(self) -> None:
+        """
+        Load the model and push a silent clip through it so the first real
+        request does not pay the model load + CUDA/cuDNN init.
+        """
+        await self._ensure_model()
+        await self._in_pool(self._transcribe_silence)
+
+    async def keepalive(self, interval_s: float) -> None:
+        """Re-run the silent warmup every `interval_s` seconds so the CUDA context stays hot."""
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await self.warmup()
+            except Exception as e:
+                log.warning("[WhisperService] keepalive warmup failed: %s", e)
+
     def _temp_suffix_for_content_type(self, content_type: str) -> str:
         ct = (content_type or "").lower()
         if "webm" in ct: return ".webm"
@@ -198,36 +217,74 @@ class WhisperService:
         if "mpeg" in ct or "mp3" in ct: return ".mp3"
         return ".wav"
 
-    async def transcribe(
-        self,
-        wav_bytes: bytes,                    # raw upload bytes (webm/ogg/wav/...)
-        language: str = "en",
-        initial_prompt: Optional[str] = None,
-        content_type: str = "audio/webm",
-    ) -> str:
-        """
-        Transcribe audio bytes → text with repetition guards.
-        """
-        await self._ensure_model()
-
-        def _decode_to_array() -> tuple[np.ndarray, int]:
-            if _HAS_DECODER:
-                return decode_to_float32_mono_16k(wav_bytes)
-            # Fallback: write tempfile and let ffmpeg inside faster-whisper handle it.
-            suffix = self._temp_suffix_for_content_type(content_type)
-            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
-                f.write(wav_bytes)
-                return np.array([]), f.name  # special sentinel: path string
-
-        # Decode
-        audio_or_path = None
-        sr = 16000
+    def _prompt_arg(self, initial_prompt: Optional[str]):
+        """Token ids for the (near-constant) prompt, cached; falls back to the raw string."""
+        if not initial_prompt:
+            return None
+        prompt = initial_prompt[:1800]
+        tok = getattr(WhisperService._model, "hf_tokenizer", None)
+        if tok is None:
+            return prompt
+        try:
+            return list(_tokenize_prompt(tok, prompt))
+        except Exception:
+            return prompt
+
+    async def _in_pool(self, fn, *args):
+        # keep blocking CTranslate2 calls off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _run_transcribe(self, audio: Optional[np.ndarray], wav_bytes: bytes, content_type: str, kwargs: dict):
+        if audio is not None:
+            return WhisperService._model.transcribe(audio=audio, **kwargs)
+        # path fallback: faster-whisper decodes the file eagerly, so it can be removed right after
+        suffix = self._temp_suffix_for_content_type(content_type)
         try:
-            decoded, sr = _decode_to_array()
-            audio_or_path = decoded if decoded.size else None
+            path = self._write_temp(wav_bytes, suffix, _TMPDIR)
+        except OSError as e:
+            if _TMPDIR is None:
+                raise
+            # e.g. ENOSPC on a small tmpfs: the system temp dir is disk-backed
+            log.warning("[WhisperService] tempfile in %s failed (%s). Using system temp dir.", _TMPDIR, e)
+            path = self._write_temp(wav_bytes, suffix, None)
+        try:
+            return WhisperService._model.transcribe(path, **kwargs)
+        finally:
+            try: os.remove(path)
+            except Exception: pass
+
+    @staticmethod
+    def _write_temp(data: bytes, suffix: str, dir: Optional[str]) -> str:
+        f = tempfile.NamedTemporaryFile(suffix=suffix, dir=dir, delete=False)
+        try:
+            with f:
+                f.write(data)
+        except OSError:
+            try: os.remove(f.name)
+            except Exception: pass
+            raise
+        return f.name
+
+    def _decode_into_scratch(self, wav_bytes: bytes) -> Optional[np.ndarray]:
+        # Decode in-process (PyAV) to float32 mono 16k; None sends the caller down the
+        # tempfile/ffmpeg route. Caller holds _scratch_lock.
+        try:
+            decoded, sr = decode_to_float32_mono_16k(wav_bytes, out=self._scratch)
         except Exception as e:
             log.warning("[WhisperService] PyAV decode failed (%s). Using path fallback.", e)
-            audio_or_path = None  # force path fallback
+            return None
+        return decoded if decoded.size and sr == 16000 else None
+
+    async def _start_segments(
+        self,
+        wav_bytes: bytes,
+        language: str,
+        initial_prompt: Optional[str],
+        content_type: str,
+    ):
+        """Decode + start transcription; returns faster-whisper's lazy (segments, info)."""
+        await self._ensure_model()
 
         # Build transcribe kwargs
         common_kwargs = dict(
@@ -236,9 +293,10 @@ class WhisperService:
             vad_filter=True,
             vad_parameters={"min_silence_duration_ms": 250, "speech_pad_ms": 150},
             beam_size=max(1, self.beam_size),
-            best_of=max(1, self.best_of),
-            temperature=[0.0, 0.2, 0.4],
-            initial_prompt=(initial_prompt[:1800] if initial_prompt else None),
+            best_of=self.best_of,
+            # single temperature: no hidden fallback sweep (which can OOM on the last segment)
+            temperature=[float(self.temperature)],
+            initial_prompt=self._prompt_arg(initial_prompt),
             word_timestamps=False,
             condition_on_previous_text=True,          # <- critical
             no_repeat_ngram_size=4,                    # <- blocks short repeats
@@ -251,36 +309,60 @@ class WhisperService:
             append_punctuations=".,!?)}]％%",
         )
 
-        # Do the transcription
-        try:
-            if isinstance(audio_or_path, np.ndarray) and audio_or_path.size:
-                segments, info = WhisperService._model.transcribe(
-                    audio=audio_or_path, **common_kwargs
-                )
-            else:
-                # path fallback (write a temp file)
-                suffix = self._temp_suffix_for_content_type(content_type)
-                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
-                    f.write(wav_bytes)
-                    path = f.name
-                segments, info = WhisperService._model.transcribe(path, **common_kwargs)
-                try: os.remove(path)
-                except Exception: pass
-        except RuntimeError as e:
-            if _is_cuda_alloc_error(str(e)) and WhisperService._loaded_cfg and WhisperService._loaded_cfg[1] == "cuda":
-                log.error("[WhisperService] CUDA transcribe failed (%s). Retrying on CPU.", e)
-                await self._load_model(device="cpu", compute_type="int8")
-                # Tighten a bit for CPU
-                common_kwargs["beam_size"] = max(1, min(3, self.beam_size))
-                common_kwargs["best_of"]   = max(1, min(3, self.best_of))
-                segments, info = WhisperService._model.transcribe(
-                    audio=audio_or_path if isinstance(audio_or_path, np.ndarray) and audio_or_path.size else path,
-                    **common_kwargs
-                )
-            else:
-                raise
+        # The scratch buffer is shared across requests: hold the lock until
+        # model.transcribe() has turned the PCM into features (it does so
+        # eagerly, before handing back the lazy segment generator).
+        async with self._scratch_lock:
+            if self._scratch is None:
+                self._scratch = np.empty(16000 * self.max_seconds, dtype=np.float32)
+
+            # decode + resample run on the pool too; the lock only guards the buffer
+            audio = await self._in_pool(self._decode_into_scratch, wav_bytes)
+
+            # Do the transcription
+            try:
+                segments, info = await self._in_pool(self._run_transcribe, audio, wav_bytes, content_type, common_kwargs)
+            except RuntimeError as e:
+                if _is_cuda_alloc_error(str(e)) and WhisperService._loaded_cfg and WhisperService._loaded_cfg[1] == "cuda":
+                    log.error("[WhisperService] CUDA transcribe failed (%s). Retrying on CPU.", e)
+                    await self._load_model(device="cpu", compute_type="int8")
+                    # Tighten a bit for CPU
+                    common_kwargs["beam_size"] = max(1, min(3, self.beam_size))
+                    common_kwargs["best_of"]   = max(1, min(3, self.best_of))
+                    segments, info = await self._in_pool(self._run_transcribe, audio, wav_bytes, content_type, common_kwargs)
+                else:
+                    raise
+        return segments, info
 
-        raw_text = " ".join(s.text.strip() for s in segments if getattr(s, "text", None)).strip()
+    async def transcribe(
+        self,
+        wav_bytes: bytes,                    # raw upload bytes (webm/ogg/wav/...)
+        language: str = "en",
+        initial_prompt: Optional[str] = None,
+        content_type: str = "audio/webm",
+    ) -> str:
+        """
+        Transcribe audio bytes → text with repetition guards.
+        """
+        segments, info = await self._start_segments(wav_bytes, language, initial_prompt, content_type)
+
+        # segments is lazy: iterating it is what actually runs the decoder, so stop
+        # pulling once we already have more text than the 2000-char cap below keeps
+        def _collect() -> Tuple[str, float, int]:
+            parts: list[str] = []
+            total, sum_lp, n = 0, 0.0, 0
+            for seg in segments:
+                sum_lp += getattr(seg, "avg_logprob", 0.0)
+                n += 1
+                t = (getattr(seg, "text", None) or "").strip()
+                if not t:
+                    continue
+                parts.append(t)
+                total += len(t) + 1
+                if total > 2200:
+                    break
+            return " ".join(parts), (sum_lp / n if n else 0.0), n
+        raw_text, avg_logprob, n_segments = await self._in_pool(_collect)
         text = _clean_transcript(raw_text)
 
         # Light normalization: capitalize first letter if sentence looks lowercased
@@ -291,12 +373,47 @@ class WhisperService:
         if len(text) > 2000:
             text = text[:2000].rsplit(" ", 1)[0] + "…"
 
-        # Optional: quick quality log
-        try:
-            avg_logprob = float(np.mean([getattr(s, "avg_logprob", 0.0) for s in segments]))
-            log.info("[WhisperService] len=%.1fs tokens=%d avg_logprob=%.3f",
-                     getattr(info, "duration", 0.0), getattr(info, "num_tokens", 0), avg_logprob)
-        except Exception:
-            pass
+        # Quick quality log (avg_logprob was accumulated while decoding; the
+        # segment generator is exhausted by now)
+        log.info("[WhisperService] len=%.1fs segments=%d avg_logprob=%.3f",
+                 getattr(info, "duration", 0.0), n_segments, avg_logprob)
 
         return text
+
+    async def transcribe_stream(
+        self,
+        wav_bytes: bytes,
+        language: str = "en",
+        initial_prompt: Optional[str] = None,
+        content_type: str = "audio/webm",
+    ) -> AsyncIterator[str]:
+        """
+        Yield each segment's text as soon as the decoder produces it, so callers
+        can show the first words before the whole clip is transcribed.
+        Segments are raw (no cross-segment cleanup like `transcribe`).
+        """
+        segments, _ = await self._start_segments(wav_bytes, language, initial_prompt, content_type)
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def _pump():
+            try:
+                for seg in segments:
+                    if stop.is_set():
+                        break
+                    t = (getattr(seg, "text", None) or "").strip()
+                    if t:
+                        loop.call_soon_threadsafe(queue.put_nowait, t)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        fut = loop.run_in_executor(self._executor, _pump)
+        try:
+            while (item := await queue.get()) is not done:
+                yield item
+            await fut  # surface decoder errors
+        finally:
+            stop.set()  # client went away: stop decoding further segments
@@ -1,11 +1,17 @@
 # app/services/tts/bark_service.py
 from __future__ import annotations
-import os, io, re, wave, asyncio, inspect, logging, gc
+import os, io, re, struct, asyncio, inspect, logging, gc, threading, hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Optional
 
 import numpy as np
 import torch
 
+# inference-only service. Grad mode is thread-local, so this covers the importing
+# thread (lifespan warmup); executor threads get inference_mode in _generate.
+torch.set_grad_enabled(False)
+
 # ---- Env knobs --------------------------------------------------------------
 # Expose GPU 0 by default (override via real env if needed). If you want CPU-only, set CUDA_VISIBLE_DEVICES=-1
 os.environ.setdefault("CUDA_VISIBLE_DEVICES", "0")
@@ -22,6 +28,187 @@ except Exception:
 
 log = logging.getLogger("tts.bark")
 
+# preload_models' keyword set differs across Bark builds; inspect it once at import
+try:
+    _PRELOAD_KWARGS: frozenset[str] = frozenset(inspect.signature(preload_models).parameters)
+except Exception:
+    _PRELOAD_KWARGS = frozenset()
+
+def _placement_kwargs(device, force_reload: bool) -> dict:
+    # builds without a device kwarg pick the GPU whenever *_use_gpu (default True) allows it
+    kwargs = {}
+    if _PRELOAD_TAKES_DEVICE:
+        kwargs["device"] = device
+    elif device.type == "cpu":
+        kwargs.update({k: False for k in _GPU_KEYS})
+    if force_reload and "force_reload" in _PRELOAD_KWARGS:
+        kwargs["force_reload"] = True  # models are cached in bark's globals; replace them
+    return kwargs
+
+def _preload_per_stage(use_small: bool, device, force_reload: bool = False):
+    preload_models(**{k: use_small for k in _SMALL_KEYS}, **_placement_kwargs(device, force_reload))
+
+def _preload_use_small(use_small: bool, device, force_reload: bool = False):
+    preload_models(use_small=use_small, **_placement_kwargs(device, force_reload))
+
+def _preload_plain(use_small: bool, device, force_reload: bool = False):
+    # size comes from SUNO_USE_SMALL_MODELS
+    preload_models(**_placement_kwargs(device, force_reload))
+
+# resolve which preload_models variant this Bark build has once, not per warmup
+_SMALL_KEYS = tuple(k for k in ("text_use_small", "coarse_use_small", "fine_use_small", "codec_use_small")
+                    if k in _PRELOAD_KWARGS)
+_GPU_KEYS = tuple(k for k in ("text_use_gpu", "coarse_use_gpu", "fine_use_gpu", "codec_use_gpu")
+                  if k in _PRELOAD_KWARGS)
+_PRELOAD_TAKES_DEVICE = "device" in _PRELOAD_KWARGS
+_PRELOAD_STYLE = ("per_stage" if {"text_use_small", "coarse_use_small", "fine_use_small"} <= _PRELOAD_KWARGS
+                  else "use_small" if "use_small" in _PRELOAD_KWARGS
+                  else "none")
+_do_preload = {"per_stage": _preload_per_stage, "use_small": _preload_use_small,
+               "none": _preload_plain}[_PRELOAD_STYLE]
+
+_WS_RE = re.compile(r"\s+")
+# one left-to-right scan for boundaries (no lookbehind); group 1 = sentence punctuation kept in the piece
+_BOUNDARY_RE = re.compile(r"([\.\?\!;])\s+|,\s{1,3}")
+
+
+# BARK_DETERMINISTIC=1 restores bit-exact cuDNN kernels for seeded renders.
+# BARK_CUDNN_BENCHMARK=1 autotunes conv kernels (the codec decoder); each new input
+# length is tuned once, so it only pays off when utterance lengths repeat.
+_DETERMINISTIC = os.getenv("BARK_DETERMINISTIC", "0") == "1"
+_CUDNN_BENCHMARK = os.getenv("BARK_CUDNN_BENCHMARK", "0") == "1"
+
+def _cuda_ok() -> bool:
+    # CUDA_VISIBLE_DEVICES="" / "-1" means CPU-only: answer without touching the CUDA runtime
+    if os.environ.get("CUDA_VISIBLE_DEVICES", "").strip() in ("", "-1"):
+        return False
+    return torch.cuda.is_available()
+
+
+# ---- Optional transformers backend (TTS_BARK_BACKEND=hf) ---------------------
+# BarkModel runs in fp16 on CUDA (fp32 on CPU); falls back to the suno package
+# when transformers is not installed.
+_BACKEND = os.getenv("TTS_BARK_BACKEND", "suno").strip().lower()
+_hf = None  # (processor, model, device) once loaded
+
+def _hf_load(use_small: bool, device) -> bool:
+    global _hf
+    if _hf is not None:
+        processor, model, loaded_on = _hf
+        if loaded_on.type != device.type:  # e.g. the GPU->CPU fallback in bark_tts
+            model = model.to(device=device, dtype=torch.float32) if device.type == "cpu" else model.to(device)
+            _hf = (processor, model, device)
+        return True
+    try:
+        from transformers import AutoProcessor, BarkModel  # type: ignore
+    except Exception as e:
+        log.warning("[Bark] transformers backend unavailable (%s); using suno bark", e)
+        return False
+    name = "suno/bark-small" if use_small else "suno/bark"
+    dtype = torch.float16 if device.type == "cuda" else torch.float32
+    processor = AutoProcessor.from_pretrained(name)
+    model = BarkModel.from_pretrained(name, torch_dtype=dtype)
+    if device.type == "cuda" and os.getenv("BARK_HF_CPU_OFFLOAD", "0") == "1":
+        model.enable_cpu_offload()  # submodels visit the GPU only while they run
+    else:
+        model = model.to(device)
+    model.eval()
+    _hf = (processor, model, device)
+    log.warning("[Bark] transformers BarkModel %s loaded on %s (%s)", name, device, dtype)
+    return True
+
+def _hf_generate(text: str, hp, tt: float, wt: float) -> np.ndarray:
+    processor, model, device = _hf
+    # voice_preset takes a preset name, an .npz path or an already-loaded prompt dict
+    inputs = processor(text, voice_preset=hp).to(device)
+    audio = model.generate(**inputs, semantic_temperature=tt, coarse_temperature=wt)
+    return audio.float().cpu().numpy().reshape(-1)
+
+# Chunks rendered per BarkModel.generate call; padding the batch trades a little
+# wasted compute on short rows for one pass instead of one per chunk. 1 disables.
+_HF_BATCH = max(1, int(os.getenv("BARK_HF_BATCH", "8")))
+
+def _hf_generate_batch(chunks: list[str], hp, tt: float, wt: float) -> list[np.ndarray]:
+    processor, model, device = _hf
+    out: list[np.ndarray] = []
+    for i in range(0, len(chunks), _HF_BATCH):
+        batch = chunks[i:i + _HF_BATCH]
+        inputs = processor(batch, voice_preset=hp).to(device)
+        try:
+            audio, lengths = model.generate(**inputs, semantic_temperature=tt, coarse_temperature=wt,
+                                            return_output_lengths=True)
+        except (TypeError, ValueError):
+            # older transformers can't report per-row lengths (rejected as an unknown
+            # generate kwarg); padded rows can't be trimmed without them
+            out.extend(_hf_generate(ch, hp, tt, wt) for ch in batch)
+            continue
+        audio = audio.float().cpu().numpy()
+        out.extend(audio[j, :int(n)] for j, n in enumerate(lengths.tolist()))
+    return out
+
+
+_threads_pinned = False
+
+def _pin_cpu_threads():
+    """Pin torch's CPU pools once; the defaults oversubscribe many-core hosts."""
+    global _threads_pinned
+    if _threads_pinned:
+        return
+    _threads_pinned = True
+    n = int(os.getenv("BARK_TORCH_THREADS", "0")) or max(1, (os.cpu_count() or 2) // 2)
+    try:
+        torch.set_num_threads(n)
+        torch.backends.mkldnn.enabled = True
+        torch.set_num_interop_threads(1)  # raises once inter-op work has started
+    except RuntimeError:
+        pass
+    log.warning("[Bark] CPU threads pinned: intra-op=%d", torch.get_num_threads())
+
+
+def _quantize_cpu_models():
+    """Opt-in (BARK_QUANTIZE_CPU=1): dynamic int8 for the Linear layers of Bark's GPTs that live on CPU."""
+    try:
+        from bark.generation import models as bark_models
+    except Exception:
+        return
+    done = []
+    for key in ("text", "coarse", "fine"):
+        m = bark_models.get(key)
+        if isinstance(m, dict):  # "text" is {"model": GPT, "tokenizer": ...}
+            m = m.get("model")
+        if m is None:
+            continue
+        # preload_models picks its own device (use_gpu), so ask the weights where they are
+        try:
+            device = next(m.parameters()).device
+        except (StopIteration, AttributeError):
+            continue
+        if device.type != "cpu":
+            log.warning("[Bark] int8 quantization of %s skipped: model is on %s", key, device)
+            continue
+        try:
+            torch.ao.quantization.quantize_dynamic(m, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+            done.append(key)
+        except Exception as e:
+            log.warning("[Bark] int8 quantization of %s skipped: %s", key, e)
+    log.warning("[Bark] int8 dynamic quantization applied to %s", done)
+
+
+def _compile_models():
+    """Opt-in (BARK_COMPILE=1): torch.compile Bark's GPTs in place of the eager modules."""
+    try:
+        from bark.generation import models as bark_models
+    except Exception:
+        return
+    for key in ("text", "coarse", "fine"):
+        try:
+            if isinstance(bark_models.get(key), dict):
+                bark_models[key]["model"] = torch.compile(bark_models[key]["model"], fullgraph=False)
+            elif key in bark_models:
+                bark_models[key] = torch.compile(bark_models[key], fullgraph=False)
+        except Exception as e:
+            log.warning("[Bark] torch.compile of %s skipped: %s", key, e)
+
 
 class BarkService:
     """
@@ -33,7 +220,20 @@ class BarkService:
 
     _is_warmed_small = False
     _is_warmed_full = False
-    _sem = asyncio.Semaphore(1)
+    _warm_lock = threading.Lock()
+    _models_device: Optional[str] = None  # device type bark's global models were loaded on
+    # Concurrent Bark renders (threads share one set of module-global models).
+    # Default 1: renders are seeded through the global torch RNG, so overlapping
+    # them makes output depend on interleaving; raise it when throughput matters more.
+    # Renders run on this dedicated FIFO pool, which both bounds concurrency and keeps
+    # the loop's default executor free for other blocking work.
+    _MAX_CONCURRENCY = max(1, int(os.getenv("BARK_MAX_CONCURRENCY", "1")))
+    _executor = ThreadPoolExecutor(max_workers=_MAX_CONCURRENCY, thread_name_prefix="bark")
+
+    # rendered WAVs keyed by every input that affects the audio (seeded requests only)
+    _wav_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+    _WAV_CACHE_SIZE = int(os.getenv("BARK_CACHE_SIZE", "128"))
+    _WAV_CACHE_DIR = os.getenv("BARK_CACHE_DIR", "")
 
     def __init__(
         self,
@@ -48,170 +248,580 @@ class BarkService:
         self.waveform_temp = float(waveform_temp)
         self.use_small_default = bool(use_small_default)
 
-        self._prefer_cuda = bool(prefer_cuda) and torch.cuda.is_available()
+        self._prefer_cuda = bool(prefer_cuda) and _cuda_ok()
         self._device = torch.device("cuda") if self._prefer_cuda else torch.device("cpu")
 
-    @classmethod
-    def _supported_kwargs(cls):
-        try:
-            sig = inspect.signature(preload_models)
-            return set(sig.parameters.keys())
-        except Exception:
-            return set()
-
     def _preload(self, *, use_small: bool):
-        supported = self._supported_kwargs()
-        desired = {
-            "use_small": use_small,           # some builds
-            "text_use_small": use_small,      # others
-            "coarse_use_small": use_small,
-            "fine_use_small": use_small,
-            "codec_use_small": use_small,
-        }
-        kwargs = {k: v for k, v in desired.items() if k in supported}
-        if "device" in supported:
-            kwargs["device"] = self._device
-        log.warning("[Bark] preload_models small=%s device=%s kwargs=%s",
-                    use_small, self._device, list(kwargs.keys()))
-        try:
-            preload_models(**kwargs) if kwargs else preload_models()
-        except TypeError:
-            preload_models()
+        # bark caches loaded models in its globals: a device change needs force_reload
+        moved = BarkService._models_device not in (None, self._device.type)
+        log.warning("[Bark] preload_models small=%s device=%s style=%s reload=%s",
+                    use_small, self._device, _PRELOAD_STYLE, moved)
+        _do_preload(use_small, self._device, force_reload=moved)
+        BarkService._models_device = self._device.type
 
-    def warm_models(self, *, use_small: bool = True):
+    def _is_warm(self, use_small: bool) -> bool:
+        return self._is_warmed_small if use_small else self._is_warmed_full
+
+    def _load_local(self, use_small: bool):
         # pick device each warm in case availability changed
-        self._device = torch.device("cuda") if (self._prefer_cuda and torch.cuda.is_available()) else torch.device("cpu")
+        self._device = torch.device("cuda") if (self._prefer_cuda and _cuda_ok()) else torch.device("cpu")
         os.environ["SUNO_USE_SMALL_MODELS"] = "1" if use_small else "0"
+        if self._device.type == "cpu":
+            _pin_cpu_threads()
+        elif _CUDNN_BENCHMARK and not _DETERMINISTIC:
+            torch.backends.cudnn.benchmark = True
 
-        if use_small and self._is_warmed_small:
+        if _BACKEND == "hf" and _hf_load(use_small, self._device):
             return
-        if (not use_small) and self._is_warmed_full:
+
+        # warmup may run on a worker thread (ensure_warm), where grad mode is still on
+        with torch.no_grad():
+            self._preload(use_small=use_small)
+            if os.getenv("BARK_QUANTIZE_CPU", "0") == "1":
+                _quantize_cpu_models()
+            if os.getenv("BARK_COMPILE", "0") == "1":
+                _compile_models()
+
+    def warm_models(self, *, use_small: bool = True):
+        if self._is_warm(use_small):
             return
+        # Bark keeps its models in module globals, so the flags (and the lock that
+        # guards them) are class-level: concurrent cold callers load weights once.
+        with self._warm_lock:
+            if self._is_warm(use_small):
+                return
+            if _PROCESS_POOL:
+                # models live in the worker process: warming = starting it and waiting for its load
+                _get_proc_pool(use_small, self._prefer_cuda).submit(_worker_ping).result()
+            else:
+                self._load_local(use_small)
+            if use_small:
+                BarkService._is_warmed_small = True
+            else:
+                BarkService._is_warmed_full = True
 
-        self._preload(use_small=use_small)
-        if use_small:
-            self._is_warmed_small = True
-        else:
-            self._is_warmed_full = True
+    @classmethod
+    def mark_cold(cls):
+        """Force the next warm to call preload_models again (e.g. after a device change)."""
+        # no _warm_lock: this runs on the event loop, and the lock is held for a whole
+        # model load; plain attribute writes are atomic, warm_models re-checks under it
+        cls._is_warmed_small = cls._is_warmed_full = False
+
+    async def ensure_warm(self, *, use_small: bool = True):
+        """Warm off the event loop; waiters coalesce on the class-level lock."""
+        if not self._is_warm(use_small):
+            await asyncio.to_thread(self.warm_models, use_small=use_small)
+
+    @staticmethod
+    def _normalize_peak(audio: np.ndarray, peak: float = 0.99) -> np.ndarray:
+        """Peak-normalize to `peak` then clip to [-1, 1] (float32 result)."""
+        if audio.size == 0:
+            return audio
+        # |audio| is computed into the output buffer, which then receives the scaled signal
+        out = np.abs(audio, dtype=np.float32)
+        m = float(out.max())
+        if not m > 0.0:
+            return np.clip(audio, -1.0, 1.0, out=out)
+        np.multiply(audio, np.float32(peak / m), out=out, casting="unsafe")
+        if peak > 1.0:
+            np.clip(out, -1.0, 1.0, out=out)
+        return out
+
+    _PCM_BLOCK = 65536  # 256 KB float32 scratch: stays in L2 between clip and scale
+
+    @classmethod
+    def _float_to_pcm16(cls, samples: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        # clip + scale + int16 cast, block by block through a small cache-resident
+        # scratch, so the audio is read from / written to memory once
+        # (NumPy's ufunc loops are SIMD-vectorized; no separate astype pass)
+        s = np.asarray(samples, dtype=np.float32).reshape(-1)
+        pcm = np.empty(s.shape, dtype=np.int16) if out is None else out
+        scratch = np.empty(min(s.size, cls._PCM_BLOCK), dtype=np.float32)
+        for i in range(0, s.size, cls._PCM_BLOCK):
+            blk = s[i:i + cls._PCM_BLOCK]
+            t = scratch[:blk.size]
+            np.clip(blk, -1.0, 1.0, out=t)
+            np.multiply(t, 32767.0, out=pcm[i:i + blk.size], casting="unsafe")
+        return pcm
+
+    # reusable int16 buffers bucketed by power-of-two length
+    _pcm_pool: dict[int, list[np.ndarray]] = {}
+    _pcm_pool_lock = threading.Lock()
+    _PCM_POOL_PER_SIZE = 2
+
+    @classmethod
+    def _pcm16_bytes(cls, samples: np.ndarray, prefix: bytes = b"") -> bytes:
+        """PCM16 bytes of `samples` (after `prefix`), copied once out of a pooled buffer."""
+        samples = np.asarray(samples).reshape(-1)
+        n = int(samples.size)
+        size = 1 << max(n - 1, 0).bit_length()
+        with cls._pcm_pool_lock:
+            bucket = cls._pcm_pool.get(size)
+            buf = bucket.pop() if bucket else None
+        if buf is None:
+            buf = np.empty(size, dtype=np.int16)
+        try:
+            cls._float_to_pcm16(samples, out=buf[:n])
+            return b"".join((prefix, memoryview(buf[:n]).cast("B")))
+        finally:
+            with cls._pcm_pool_lock:
+                bucket = cls._pcm_pool.setdefault(size, [])
+                if len(bucket) < cls._PCM_POOL_PER_SIZE:
+                    bucket.append(buf)
+
+    @staticmethod
+    def _wav_header(sr: int, nbytes: Optional[int] = None) -> bytes:
+        """44-byte PCM16 mono header; nbytes=None writes 0xFFFFFFFF sizes (streamable WAV)."""
+        data = 0xFFFFFFFF if nbytes is None else nbytes
+        riff = 0xFFFFFFFF if nbytes is None else 36 + nbytes
+        return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", riff, b"WAVE", b"fmt ", 16, 1, 1,
+                           sr, sr * 2, 2, 16, b"data", data)
 
     @staticmethod
     def _to_wav_bytes(samples: np.ndarray, sr: int = SAMPLE_RATE) -> bytes:
-        s = np.clip(samples.astype(np.float32, copy=False), -1.0, 1.0)
-        pcm = (s * 32767.0).astype(np.int16)
-        bio = io.BytesIO()
-        with wave.open(bio, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sr)
-            wf.writeframes(pcm.tobytes())
-        bio.seek(0)
-        return bio.getvalue()
+        n = int(np.size(samples))
+        return BarkService._pcm16_bytes(samples, prefix=BarkService._wav_header(sr, 2 * n))
+
+    @classmethod
+    def _to_opus_bytes(cls, samples: np.ndarray, sr: int = SAMPLE_RATE, bitrate: int = 32000) -> bytes:
+        """Ogg/Opus via PyAV (~10x smaller than PCM WAV for speech); WAV if PyAV/libopus is missing."""
+        try:
+            import av  # type: ignore
+            pcm = cls._float_to_pcm16(np.asarray(samples).reshape(-1)).reshape(1, -1)
+            bio = io.BytesIO()
+            with av.open(bio, mode="w", format="ogg") as container:
+                stream = container.add_stream("libopus", rate=sr)
+                stream.bit_rate = bitrate
+                stream.layout = "mono"
+                frame = av.AudioFrame.from_ndarray(pcm, format="s16", layout="mono")
+                frame.sample_rate = sr
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+                for packet in stream.encode(None):
+                    container.mux(packet)
+            return bio.getvalue()
+        except Exception as e:
+            log.warning("[Bark] opus encode unavailable (%s); returning WAV", e)
+            return cls._to_wav_bytes(samples, sr)
 
     @staticmethod
-    def _split_into_chunks(text: str) -> list[str]:
-        text = re.sub(r"\s+", " ", text or "").strip()
+    def _split_into_chunks(text: str, max_chars: int = 120) -> list[str]:
+        text = _WS_RE.sub(" ", text or "").strip()
         if not text:
             return []
-        parts = re.split(r"(?<=[\.\?\!;])\s+|,\s{1,3}", text)
-        chunks, buf = [], ""
+        parts: list[str] = []
+        prev = 0
+        for m in _BOUNDARY_RE.finditer(text):
+            parts.append(text[prev:m.end(1) if m.group(1) else m.start()])
+            prev = m.end()
+        parts.append(text[prev:])
+        chunks: list[str] = []
+        cur: list[str] = []
+        cur_len = 0
         for p in parts:
-            nxt = (buf + " " + p).strip() if buf else p
-            if len(nxt) <= 120:
-                buf = nxt
+            p = p.strip()
+            if not p:
+                continue
+            add = len(p) + (1 if cur else 0)
+            if cur_len + add <= max_chars:
+                cur.append(p)
+                cur_len += add
             else:
-                if buf:
-                    chunks.append(buf)
-                buf = p
-        if buf:
-            chunks.append(buf)
+                if cur:
+                    chunks.append(" ".join(cur))
+                cur, cur_len = [p], len(p)
+        if cur:
+            chunks.append(" ".join(cur))
         return chunks[:12]
 
-    def _seed_all(self, seed: int):
+    @staticmethod
+    def _seed_all(seed: int, deterministic: bool = _DETERMINISTIC):
         import random
         random.seed(seed)
         np.random.seed(seed)
         try:
             torch.manual_seed(seed)
-            if torch.cuda.is_available():
+            if _cuda_ok():
                 torch.cuda.manual_seed_all(seed)
-                torch.backends.cudnn.deterministic = True
-                torch.backends.cudnn.benchmark = False
+                # bit-exact cuDNN kernels cost throughput; only when asked for
+                if deterministic:
+                    torch.backends.cudnn.deterministic = True
+                    torch.backends.cudnn.benchmark = False
         except Exception:
             pass
 
-    async def synthesize_bytes(
+    async def _prepare(
         self,
         text: str,
         *,
-        voice: str | None = None,
-        use_small: bool | None = None,
-        seed: int | None = 12345,
-        text_temp: float | None = None,
-        waveform_temp: float | None = None,
-    ) -> bytes:
+        voice: str | None,
+        use_small: bool | None,
+        text_temp: float | None,
+        waveform_temp: float | None,
+    ):
+        """Warm models and resolve (history_prompt, text_temp, waveform_temp)."""
         small = self.use_small_default if use_small is None else bool(use_small)
         try:
-            self.warm_models(use_small=small)
+            await self.ensure_warm(use_small=small)
         except Exception as e:
             log.error("[Bark] warm_models failed: %s", e, exc_info=True)
-            self._is_warmed_small = self._is_warmed_full = False
-            gc.collect()
-            self.warm_models(use_small=small)
-
-        if seed is not None:
-            self._seed_all(int(seed))
+            self.mark_cold()
+            await self.ensure_warm(use_small=small)
 
         preset = (voice or self.voice_preset) or "v2/es_speaker_0"
         hp = preset
         try:
             if isinstance(preset, str) and preset.lower().endswith(".npz") and os.path.exists(preset):
-                from bark.generation import load_history_prompt
-                hp = load_history_prompt(preset)
+                hp = self._load_history_prompt(preset)
         except Exception:
             hp = preset
 
+        tt, wt = self._temps(text_temp, waveform_temp)
+        return hp, tt, wt
+
+    # loaded .npz voice prompts keyed by (path, mtime) so edits on disk are picked up
+    _hp_cache: "OrderedDict[tuple[str, int], object]" = OrderedDict()
+    _HP_CACHE_SIZE = 8
+
+    @classmethod
+    def _load_history_prompt(cls, path: str):
+        key = (path, os.stat(path).st_mtime_ns)
+        hp = cls._hp_cache.get(key)
+        if hp is None:
+            from bark.generation import load_history_prompt
+            hp = load_history_prompt(path)
+            cls._hp_cache[key] = hp
+            while len(cls._hp_cache) > cls._HP_CACHE_SIZE:
+                cls._hp_cache.popitem(last=False)
+        else:
+            cls._hp_cache.move_to_end(key)
+        return hp
+
+    def _temps(self, text_temp: float | None, waveform_temp: float | None) -> tuple[float, float]:
         tt = (self.text_temp if text_temp is None else float(text_temp)) or 0.5
         wt = (self.waveform_temp if waveform_temp is None else float(waveform_temp)) or 0.5
+        return tt, wt
+
+    @staticmethod
+    def _voice_version(preset: str) -> int:
+        # an edited .npz must not keep serving audio rendered from the old prompt
+        if preset.lower().endswith(".npz"):
+            try:
+                return os.stat(preset).st_mtime_ns
+            except OSError:
+                pass
+        return 0
+
+    async def _cache_get(self, key: tuple) -> Optional[bytes]:
+        wav = self._wav_cache.get(key)
+        if wav is not None:
+            self._wav_cache.move_to_end(key)
+            return wav
+        if self._WAV_CACHE_DIR:
+            wav = await asyncio.to_thread(self._cache_read, key)
+            if wav is not None:
+                self._cache_remember(key, wav)
+        return wav
+
+    async def _cache_put(self, key: tuple, wav: bytes):
+        if self._WAV_CACHE_SIZE <= 0:
+            return
+        self._cache_remember(key, wav)
+        if self._WAV_CACHE_DIR:
+            await asyncio.to_thread(self._cache_write, key, wav)
+
+    def _cache_remember(self, key: tuple, wav: bytes):
+        self._wav_cache[key] = wav
+        self._wav_cache.move_to_end(key)
+        while len(self._wav_cache) > self._WAV_CACHE_SIZE:
+            self._wav_cache.popitem(last=False)
+
+    @classmethod
+    def _cache_read(cls, key: tuple) -> Optional[bytes]:
+        try:
+            with open(os.path.join(cls._WAV_CACHE_DIR, cls._cache_name(key)), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @classmethod
+    def _cache_write(cls, key: tuple, wav: bytes):
+        try:
+            os.makedirs(cls._WAV_CACHE_DIR, exist_ok=True)
+            with open(os.path.join(cls._WAV_CACHE_DIR, cls._cache_name(key)), "wb") as f:
+                f.write(wav)
+        except OSError as e:
+            log.warning("[Bark] cache write failed: %s", e)
+
+    @staticmethod
+    def _cache_name(key: tuple) -> str:
+        return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest() + ".wav"
+
+    # how much text one generate_audio call handles comfortably (~Bark's 13-14 s window)
+    SINGLE_CALL_CHAR_LIMIT = int(os.getenv("BARK_CONTEXT_CHARS", "220"))
+
+    def _text_chunks(self, text: str) -> list[str]:
+        # short utterances go to Bark in one call; longer ones are packed on
+        # sentence/comma boundaries up to the same limit, so each generate_audio
+        # call (and its per-call model/prompt setup) covers as much text as it can
+        if len(text.strip()) <= self.SINGLE_CALL_CHAR_LIMIT:
+            return [text.strip()]
+        return self._split_into_chunks(text, max_chars=self.SINGLE_CALL_CHAR_LIMIT) or [""]
 
-        chunks = self._split_into_chunks(text) or [""]
+    @staticmethod
+    def _generate(text: str, hp, tt: float, wt: float) -> np.ndarray:
+        with torch.inference_mode():
+            if _hf is not None:
+                return _hf_generate(text, hp, tt, wt)
+            return generate_audio(text, history_prompt=hp, text_temp=tt, waveform_temp=wt)
 
-        SINGLE_CALL_CHAR_LIMIT = 220
-        if len(text.strip()) <= SINGLE_CALL_CHAR_LIMIT:
-            async with self._sem:
-                def _one():
-                    return generate_audio(text.strip(), history_prompt=hp, text_temp=tt, waveform_temp=wt)
-                loop = asyncio.get_running_loop()
-                samples = await loop.run_in_executor(None, _one)
-            return self._to_wav_bytes(samples)
+    # BARK_CHUNK_WORKERS>1 renders a long utterance's chunks concurrently (each on its
+    # own CUDA stream on GPU). All chunks share the history prompt, so the voice is
+    # unchanged, but seeded output is no longer reproducible once chunks overlap.
+    _CHUNK_WORKERS = max(1, int(os.getenv("BARK_CHUNK_WORKERS", "1")))
+    # created eagerly like _executor (threads start on first use): a lazy check-then-create
+    # would race when BARK_MAX_CONCURRENCY>1 runs several _render_sync calls at once
+    _chunk_pool: Optional[ThreadPoolExecutor] = (
+        ThreadPoolExecutor(max_workers=_CHUNK_WORKERS, thread_name_prefix="bark-chunk")
+        if _CHUNK_WORKERS > 1 else None
+    )
 
-        async with self._sem:
-            def _run_once():
-                audio_all = None
-                for ch in chunks:
-                    audio = generate_audio(ch, history_prompt=hp, text_temp=tt, waveform_temp=wt)
-                    audio_all = audio if audio_all is None else np.concatenate([audio_all, audio])
-                return audio_all if audio_all is not None else np.zeros(1, dtype=np.float32)
+    @classmethod
+    def _generate_on_stream(cls, text: str, hp, tt: float, wt: float) -> np.ndarray:
+        if not _cuda_ok():
+            return cls._generate(text, hp, tt, wt)
+        stream = torch.cuda.Stream()
+        with torch.cuda.stream(stream):
+            audio = cls._generate(text, hp, tt, wt)
+        stream.synchronize()
+        return audio
 
-            loop = asyncio.get_running_loop()
-            samples = await loop.run_in_executor(None, _run_once)
+    @classmethod
+    def _render_sync(cls, chunks: list[str], hp, tt: float, wt: float, seed: int | None = None) -> np.ndarray:
+        # seed on the rendering thread, right before generation, so queued renders
+        # can't consume each other's RNG stream
+        if seed is not None:
+            cls._seed_all(int(seed))
+        if _hf is not None and _HF_BATCH > 1 and len(chunks) > 1:
+            with torch.inference_mode():
+                raw = _hf_generate_batch(chunks, hp, tt, wt)
+        elif cls._chunk_pool is not None and len(chunks) > 1:
+            raw = list(cls._chunk_pool.map(lambda ch: cls._generate_on_stream(ch, hp, tt, wt), chunks))
+        else:
+            raw = [cls._generate(ch, hp, tt, wt) for ch in chunks]
+        # contiguous float32 parts make the single final concatenate a plain memcpy
+        parts = [np.ascontiguousarray(a, dtype=np.float32) for a in raw]
+        return np.concatenate(parts, axis=0) if parts else np.zeros(1, dtype=np.float32)
 
-        return self._to_wav_bytes(samples)
+    async def _render(self, chunks: list[str], hp, tt: float, wt: float, seed: int | None,
+                      use_small: bool | None = None) -> np.ndarray:
+        if _PROCESS_POOL:
+            small = self.use_small_default if use_small is None else bool(use_small)
+            fut = _get_proc_pool(small, self._prefer_cuda).submit(_worker_render, chunks, hp, tt, wt, seed)
+            try:
+                name, n = await asyncio.wrap_future(fut)
+            except asyncio.CancelledError:
+                # a render already running in the worker still creates its segment
+                fut.add_done_callback(_discard_shared)
+                raise
+            return _take_shared(name, n)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._render_sync, chunks, hp, tt, wt, seed)
 
-    async def synthesize_stream(self, *args, **kwargs):
-        wav = await self.synthesize_bytes(*args, **kwargs)
-        yield wav
+    async def _synthesize_samples(
+        self,
+        text: str,
+        *,
+        voice: str | None,
+        use_small: bool | None,
+        seed: int | None,
+        text_temp: float | None,
+        waveform_temp: float | None,
+    ) -> np.ndarray:
+        hp, tt, wt = await self._prepare(text, voice=voice, use_small=use_small,
+                                         text_temp=text_temp, waveform_temp=waveform_temp)
+        return await self._render(self._text_chunks(text), hp, tt, wt, seed, use_small)
+
+    async def synthesize_pcm(
+        self,
+        text: str,
+        *,
+        voice: str | None = None,
+        use_small: bool | None = None,
+        seed: int | None = 12345,
+        text_temp: float | None = None,
+        waveform_temp: float | None = None,
+    ) -> tuple[np.ndarray, int]:
+        """Render `text` to (float32 mono samples in [-1, 1], sample_rate) without encoding."""
+        samples = await self._synthesize_samples(
+            text, voice=voice, use_small=use_small, seed=seed,
+            text_temp=text_temp, waveform_temp=waveform_temp,
+        )
+        return samples, SAMPLE_RATE
+
+    async def synthesize_bytes(
+        self,
+        text: str,
+        *,
+        voice: str | None = None,
+        use_small: bool | None = None,
+        seed: int | None = 12345,
+        text_temp: float | None = None,
+        waveform_temp: float | None = None,
+        encode: str = "wav",
+    ) -> bytes:
+        """Render `text` to WAV bytes, or Ogg/Opus bytes with encode="opus"."""
+        key = None
+        if seed is not None:
+            small = self.use_small_default if use_small is None else bool(use_small)
+            preset = voice or self.voice_preset
+            key = (text.strip(), preset, self._voice_version(preset), _BACKEND, small, int(seed),
+                   *self._temps(text_temp, waveform_temp), encode)
+            cached = await self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        samples = await self._synthesize_samples(
+            text, voice=voice, use_small=use_small, seed=seed,
+            text_temp=text_temp, waveform_temp=waveform_temp,
+        )
+
+        if encode == "opus":
+            wav = await asyncio.to_thread(self._to_opus_bytes, samples)
+        else:
+            wav = self._to_wav_bytes(samples)
+        if key is not None:
+            await self._cache_put(key, wav)
+        return wav
+
+    async def synthesize_stream(
+        self,
+        text: str,
+        *,
+        voice: str | None = None,
+        use_small: bool | None = None,
+        seed: int | None = 12345,
+        text_temp: float | None = None,
+        waveform_temp: float | None = None,
+    ):
+        """
+        Yield a streamable WAV: the header (unknown length) together with the first
+        chunk's PCM, then each further chunk as soon as Bark finishes it, so playback
+        can start after the first chunk instead of after the whole utterance.
+        Warmup and the first render happen before anything is yielded, so their
+        failures surface on the first __anext__() (before a response is committed).
+        """
+        hp, tt, wt = await self._prepare(text, voice=voice, use_small=use_small,
+                                         text_temp=text_temp, waveform_temp=waveform_temp)
+        # finer sentence/comma chunks than _text_chunks: the first one renders quickly,
+        # so playback starts early even for utterances that fit in a single call
+        chunks = self._split_into_chunks(text) or [text.strip()]
+
+        parts = self._run_stream(chunks, hp, tt, wt, seed, use_small)
+        try:
+            first = await parts.__anext__()
+            yield self._pcm16_bytes(first, prefix=self._wav_header(SAMPLE_RATE))
+            async for audio in parts:
+                yield self._pcm16_bytes(audio)
+        finally:
+            await parts.aclose()  # cancels the look-ahead render if the client left
+
+    async def _run_stream(self, chunks: list[str], hp, tt: float, wt: float, seed: int | None,
+                          use_small: bool | None = None):
+        """Yield each chunk's audio, with the next chunk already rendering while the caller sends it."""
+        if not chunks:
+            return
+        nxt = asyncio.ensure_future(self._render(chunks[:1], hp, tt, wt, seed, use_small))
+        try:
+            for i in range(len(chunks)):
+                audio = await nxt
+                if i + 1 < len(chunks):
+                    nxt = asyncio.ensure_future(self._render([chunks[i + 1]], hp, tt, wt, None, use_small))
+                yield audio
+        finally:
+            if not nxt.done():
+                nxt.cancel()  # client went away: don't start a render nobody will read
+
+
+# ---- Optional worker process (BARK_PROCESS_POOL=1) ---------------------------
+# Keeps Bark's long GIL-holding stretches out of the API process. Each worker
+# loads its own models; audio comes back through shared memory, not pickling.
+_PROCESS_POOL = os.getenv("BARK_PROCESS_POOL", "0") == "1"
+# one pool per (use_small, prefer_cuda): a worker only holds the model size it was started with
+_proc_pools: dict[tuple[bool, bool], ProcessPoolExecutor] = {}
+_proc_pool_lock = threading.Lock()
+_worker_svc: Optional[BarkService] = None
+
+def _get_proc_pool(use_small: bool, prefer_cuda: bool) -> ProcessPoolExecutor:
+    key = (bool(use_small), bool(prefer_cuda))
+    with _proc_pool_lock:
+        pool = _proc_pools.get(key)
+        if pool is None:
+            import multiprocessing as mp
+            pool = _proc_pools[key] = ProcessPoolExecutor(
+                max_workers=BarkService._MAX_CONCURRENCY,  # one model replica per worker
+                mp_context=mp.get_context("spawn"),  # CUDA can't be re-initialized in a forked child
+                initializer=_worker_init,
+                initargs=key,
+            )
+        return pool
+
+def _worker_init(use_small: bool, prefer_cuda: bool):
+    global _PROCESS_POOL, _worker_svc
+    _PROCESS_POOL = False  # inside the worker, render in-process
+    _worker_svc = BarkService(use_small_default=use_small, prefer_cuda=prefer_cuda)
+    _worker_svc.warm_models(use_small=use_small)
+
+def _worker_ping() -> bool:
+    return True
+
+def _worker_render(chunks: list[str], hp, tt: float, wt: float, seed: int | None) -> tuple[str, int]:
+    from multiprocessing import shared_memory
+    audio = np.ascontiguousarray(BarkService._render_sync(chunks, hp, tt, wt, seed), dtype=np.float32)
+    shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+    np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+    shm.close()
+    return shm.name, int(audio.size)
+
+def _take_shared(name: str, n: int) -> np.ndarray:
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray((n,), dtype=np.float32, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+def _discard_shared(fut) -> None:
+    """Done-callback for a render whose caller was cancelled: free the unread segment."""
+    if fut.cancelled() or fut.exception() is not None:
+        return
+    from multiprocessing import shared_memory
+    try:
+        shm = shared_memory.SharedMemory(name=fut.result()[0])
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
 
 
 # Singleton accessor
+def _prefer_cuda_default() -> bool:
+    # TTS_BARK_DEVICE=cpu keeps the shared service off the GPU; anything else tries CUDA first
+    return (os.getenv("TTS_BARK_DEVICE") or "cuda").strip().lower() != "cpu"
+
 _service: Optional[BarkService] = None
 def get_bark_service() -> BarkService:
     global _service
     if _service is None:
         # prefer_cuda=True tries GPU; falls back to CPU if unavailable
-        _service = BarkService(use_small_default=True, prefer_cuda=True)
+        _service = BarkService(use_small_default=True, prefer_cuda=_prefer_cuda_default())
     return _service
 
-def reset_bark_service():
+def reset_bark_service(prefer_cuda: Optional[bool] = None):
     global _service
-    _service = BarkService(use_small_default=True, prefer_cuda=True)
+    BarkService.mark_cold()
+    if prefer_cuda is None:
+        prefer_cuda = _prefer_cuda_default()
+    _service = BarkService(use_small_default=True, prefer_cuda=prefer_cuda)
     gc.collect()
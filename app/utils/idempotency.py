@@ -39,6 +39,14 @@ def idempotency_mark_seen(req_id: Optional[str]) -> None:
     if req_id:
         _seen_ids[req_id] = time.time()
 
+def idempotency_clear_seen(req_id: Optional[str]) -> None:
+    """
+    Drop the in-flight mark when the request fails or is cancelled before
+    idempotency_store, so the client's retry is not rejected as a duplicate.
+    """
+    if req_id:
+        _seen_ids.pop(req_id, None)
+
 def idempotency_store(req_id: Optional[str], value: Any) -> None:
     if req_id:
         _response_cache[req_id] = value
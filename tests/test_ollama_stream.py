@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import httpx
+
+from app.services.judge import ollama_client
+from app.services.judge.ollama_client import OllamaJudge
+
+LINES = [b'{"response":"hi"}\n', b'{"response":" there"}\n', b'{"done":true}\n']
+GAP = 0.2
+
+
+def _patch_client(monkeypatch, name, transport):
+    real = getattr(httpx, name)
+    monkeypatch.setattr(ollama_client.httpx, name, lambda **kw: real(transport=transport, **kw))
+
+
+def test_a_stream_yields_first_token_before_stream_ends(monkeypatch):
+    async def body():
+        for line in LINES:
+            yield line
+            await asyncio.sleep(GAP)
+
+    _patch_client(monkeypatch, "AsyncClient", httpx.MockTransport(lambda req: httpx.Response(200, content=body())))
+
+    async def run():
+        t0 = time.monotonic()
+        got = []
+        async for tok in OllamaJudge(url="http://ollama.test/api/generate").a_stream("x"):
+            got.append((tok, time.monotonic() - t0))
+        return got
+
+    got = asyncio.run(run())
+    assert [t for t, _ in got] == ["hi", " there"]
+    assert got[0][1] < GAP
+
+
+def test_stream_yields_first_token_before_stream_ends(monkeypatch):
+    def body():
+        for line in LINES:
+            yield line
+            time.sleep(GAP)
+
+    _patch_client(monkeypatch, "Client", httpx.MockTransport(lambda req: httpx.Response(200, content=body())))
+
+    t0 = time.monotonic()
+    got = [(tok, time.monotonic() - t0) for tok in OllamaJudge(url="http://ollama.test/api/generate").stream("x")]
+    assert [t for t, _ in got] == ["hi", " there"]
+    assert got[0][1] < GAP
@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import stt
+
+
+def test_stt_stream_writes_one_line_per_segment(monkeypatch):
+    segments = [SimpleNamespace(text=t) for t in (" Hello there.", "", "  How are you? ")]
+
+    async def start_segments(wav_bytes, language, initial_prompt, content_type):
+        assert wav_bytes == b"fake-audio"
+        return iter(segments), SimpleNamespace(duration=1.0)
+
+    monkeypatch.setattr(stt.svc, "_start_segments", start_segments)
+    app = FastAPI()
+    app.include_router(stt.router)
+
+    r = TestClient(app).post("/stt/stream", files={"audio": ("a.webm", b"fake-audio", "audio/webm")})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    # empty segments are dropped; each remaining one is stripped and newline-terminated
+    assert r.text == "Hello there.\nHow are you?\n"
@@ -0,0 +1,88 @@
+import asyncio
+import struct
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import tts
+from app.services.tts.bark_service import BarkService
+
+SR = 24000
+CHUNK_AUDIO = {
+    "Hello there.": np.array([0.5, -0.5, 0.25], dtype=np.float32),
+    "How are you?": np.array([1.0, -1.0], dtype=np.float32),
+}
+TEXT = " ".join(CHUNK_AUDIO)
+
+
+def _stub_service(monkeypatch) -> BarkService:
+    svc = BarkService(prefer_cuda=False)
+
+    async def prepare(self, text, **kw):
+        return "voice", 0.7, 0.7
+
+    async def render(self, chunks, hp, tt, wt, seed, use_small=None):
+        return np.concatenate([CHUNK_AUDIO[c] for c in chunks])
+
+    monkeypatch.setattr(BarkService, "_prepare", prepare)
+    monkeypatch.setattr(BarkService, "_render", render)
+    # one chunk per sentence, whatever the default packing limit is
+    monkeypatch.setattr(BarkService, "_split_into_chunks", staticmethod(lambda text, max_chars=120: list(CHUNK_AUDIO)))
+    monkeypatch.setattr(tts, "get_bark_service", lambda: svc)
+    return svc
+
+
+def _pcm16(a: np.ndarray) -> bytes:
+    return (np.clip(a, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+def _check_header(header: bytes):
+    riff, riff_size, wave, fmt, fmt_size, pcm, channels, sr, byte_rate, align, bits, data, data_size = \
+        struct.unpack("<4sI4s4sIHHIIHH4sI", header)
+    assert (riff, wave, fmt, data) == (b"RIFF", b"WAVE", b"fmt ", b"data")
+    assert (fmt_size, pcm, channels, sr, byte_rate, align, bits) == (16, 1, 1, SR, SR * 2, 2, 16)
+    # length unknown up front: streamable WAV uses the max sizes
+    assert riff_size == data_size == 0xFFFFFFFF
+
+
+def test_synthesize_stream_frames_header_then_one_pcm_part_per_chunk(monkeypatch):
+    svc = _stub_service(monkeypatch)
+
+    async def collect():
+        return [p async for p in svc.synthesize_stream(TEXT)]
+
+    parts = asyncio.run(collect())
+    pcm = [_pcm16(a) for a in CHUNK_AUDIO.values()]
+    assert len(parts) == len(CHUNK_AUDIO)
+    # the header goes out together with the first chunk, never on its own
+    _check_header(parts[0][:44])
+    assert parts[0][44:] == pcm[0]
+    assert parts[1:] == pcm[1:]
+
+
+def test_tts_stream_endpoint(monkeypatch):
+    _stub_service(monkeypatch)
+    app = FastAPI()
+    app.include_router(tts.router)
+
+    r = TestClient(app).post("/tts/stream", json={"text": TEXT})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "audio/wav"
+    _check_header(r.content[:44])
+    assert r.content[44:] == b"".join(_pcm16(a) for a in CHUNK_AUDIO.values())
+
+
+def test_tts_stream_endpoint_returns_5xx_when_first_render_fails(monkeypatch):
+    _stub_service(monkeypatch)
+
+    async def render(self, chunks, hp, tt, wt, seed, use_small=None):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(BarkService, "_render", render)
+    app = FastAPI()
+    app.include_router(tts.router)
+
+    r = TestClient(app).post("/tts/stream", json={"text": TEXT})
+    assert r.status_code == 500
+    assert not r.content.startswith(b"RIFF")